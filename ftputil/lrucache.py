@@ -44,12 +44,13 @@ discarded. [1]_
 
 """
 
+import collections
 import time
 
 
 # The suffix after the hyphen denotes modifications by the
 # ftputil project with respect to the original version.
-__version__ = "0.2-15"
+__version__ = "0.2-16"
 __all__ = ["CacheKeyError", "LRUCache", "DEFAULT_SIZE"]
 __docformat__ = "reStructuredText en"
 
@@ -111,20 +112,16 @@ class LRUCache:
     class _Node:
         """Record of a cached value. Not for public consumption."""
 
-        def __init__(self, key, obj, timestamp, sort_key):
+        # A cache may hold thousands of nodes, so avoid a `__dict__`
+        # for each of them.
+        __slots__ = ("key", "obj", "atime", "mtime")
+
+        def __init__(self, key, obj, timestamp):
             object.__init__(self)
             self.key = key
             self.obj = obj
             self.atime = timestamp
             self.mtime = self.atime
-            self._sort_key = sort_key
-
-        def __lt__(self, other):
-            # Seems to be preferred over `__cmp__`, at least in newer
-            # Python versions. Uses only around 60 % of the time
-            # with respect to `__cmp__`.
-            # pylint: disable=protected-access
-            return self._sort_key < other._sort_key
 
         def __repr__(self):
             return "<%s %s => %s (%s)>" % (
@@ -150,22 +147,13 @@ class LRUCache:
 
         The `size` attribute of the cache isn't modified.
         """
+        # The order of the dictionary is the access order, from the
+        # least to the most recently used node. Moving an accessed
+        # node to the end and removing the least recently used node
+        # from the start are O(1) operations.
+        #
         # pylint: disable=attribute-defined-outside-init
-        self.__heap = []
-        self.__dict = {}
-        self.__counter = 0
-
-    def _sort_key(self):
-        """Return a new integer value upon every call.
-
-        Cache nodes need a monotonically increasing time indicator.
-        `time.time()` and `time.clock()` don't guarantee this in a
-        platform-independent way.
-
-        See http://ftputil.sschwarzer.net/trac/ticket/32 for details.
-        """
-        self.__counter += 1
-        return self.__counter
+        self.__dict = collections.OrderedDict()
 
     def __len__(self):
         """Return _current_ number of cache entries.
@@ -173,7 +161,7 @@ class LRUCache:
         This may be different from the value of the `size`
         attribute.
         """
-        return len(self.__heap)
+        return len(self.__dict)
 
     def __contains__(self, key):
         """Return `True` if the item denoted by `key` is in the cache."""
@@ -186,7 +174,6 @@ class LRUCache:
         would exceed the maximum cache size, the least recently
         used item in the cache is "forgotten".
         """
-        heap = self.__heap
         dict_ = self.__dict
         if key in dict_:
             node = dict_[key]
@@ -194,20 +181,22 @@ class LRUCache:
             node.obj = obj
             node.atime = time.time()
             node.mtime = node.atime
-            # pylint: disable=protected-access
-            node._sort_key = self._sort_key()
+            dict_.move_to_end(key)
         else:
-            # The size of the heap can be at most the value of
+            # The size of the dictionary can be at most the value of
             # `self.size` because `__setattr__` decreases the cache
             # size if the new size value is smaller; so we don't
             # need a loop _here_.
-            if len(heap) == self.size:
-                lru_node = min(heap)
-                heap.remove(lru_node)
-                del dict_[lru_node.key]
-            node = self._Node(key, obj, time.time(), self._sort_key())
+            if len(dict_) == self.size:
+                # Reuse the node of the least recently used item
+                # instead of allocating a new one.
+                _, node = dict_.popitem(last=False)
+                node.key = key
+                node.obj = obj
+                node.atime = node.mtime = time.time()
+            else:
+                node = self._Node(key, obj, time.time())
             dict_[key] = node
-            heap.append(node)
 
     def __getitem__(self, key):
         """Return the item stored under `key` key.
@@ -221,8 +210,7 @@ class LRUCache:
             node = self.__dict[key]
             # Update node object in-place.
             node.atime = time.time()
-            # pylint: disable=protected-access
-            node._sort_key = self._sort_key()
+            self.__dict.move_to_end(key)
             return node.obj
 
     def __delitem__(self, key):
@@ -234,45 +222,38 @@ class LRUCache:
         if not key in self.__dict:
             raise CacheKeyError(key)
         else:
-            node = self.__dict[key]
-            self.__heap.remove(node)
-            del self.__dict[key]
+            node = self.__dict.pop(key)
             return node.obj
 
     def __iter__(self):
         """Iterate over the cache, from the least to the most
         recently accessed item.
         """
-        self.__heap.sort()
-        for node in self.__heap:
-            yield node.key
+        # Iterate over a copy of the keys, so that accessing the
+        # items during the iteration doesn't change the order we
+        # iterate in.
+        return iter(list(self.__dict))
 
     def __setattr__(self, name, value):
         """If the name of the attribute is "size", set the
         _maximum_ size of the cache to the supplied value.
         """
         object.__setattr__(self, name, value)
-        # Automagically shrink heap on resize.
+        # Automagically shrink cache on resize.
         if name == "size":
             size = value
             if not isinstance(size, int):
                 raise TypeError("cache size (%r) must be an integer" % size)
             if size <= 0:
                 raise ValueError("cache size (%d) must be positive" % size)
-            heap = self.__heap
             dict_ = self.__dict
-            # Do we need to remove anything at all?
-            if len(heap) <= self.size:
-                return
-            # Remove enough nodes to reach the new size.
-            heap.sort()
-            node_count_to_remove = len(heap) - self.size
-            for node in heap[:node_count_to_remove]:
-                del dict_[node.key]
-            del heap[:node_count_to_remove]
+            # Remove the least recently used nodes until we reach the
+            # new size.
+            while len(dict_) > size:
+                dict_.popitem(last=False)
 
     def __repr__(self):
-        return "<%s (%d elements)>" % (str(self.__class__), len(self.__heap))
+        return "<%s (%d elements)>" % (str(self.__class__), len(self.__dict))
 
     def mtime(self, key):
         """Return the last modification time for the cache record with key.
@@ -6,7 +6,11 @@
 Session factory factory (the two "factory" are intentional :-) ) for ftputil.
 """
 
+import collections
 import ftplib
+import functools
+import re
+import socket
 
 import ftputil.error
 import ftputil.tool
@@ -15,24 +19,188 @@ import ftputil.tool
 __all__ = ["session_factory"]
 
 
+# Lowercase encoding names for which we send "OPTS UTF8 ON".
+_UTF8_NAMES = frozenset(["utf-8", "utf8"])
+
+# Bits for the features in the `FEAT` output we may be interested in. A
+# server's features are stored as the bitwise "or" of these values.
+_FEATURE_BITS = {
+    "UTF8": 1 << 0,
+    "MLST": 1 << 1,
+    "MDTM": 1 << 2,
+    "SIZE": 1 << 3,
+    "REST STREAM": 1 << 4,
+    "MFMT": 1 << 5,
+}
+
+# Feature line of `FEAT` output. The leading space is important. See RFC 2389
+# and RFC 2640.
+_FEATURE_LINE_REGEX = re.compile(r"^ (\S.*?)\s*$", re.MULTILINE)
+
+# Exceptions for 4xx and 5xx responses to "OPTS UTF8 ON". The session is an
+# `ftplib.FTP`-like object, so we get `ftplib` exceptions, not `ftputil` ones.
+_OPTS_UTF8_ON_ERRORS = (ftplib.error_temp, ftplib.error_perm)
+
+
+def _feature_bits(feat_output):
+    """
+    Return the features listed in the `FEAT` command output `feat_output` as
+    an integer made from the values in `_FEATURE_BITS`. Unknown features are
+    ignored.
+    """
+    feature_bits = 0
+    for feature in _FEATURE_LINE_REGEX.findall(feat_output):
+        feature = feature.upper()
+        # Some features have parameters, for example "MLST size*;modify*;".
+        feature_bits |= _FEATURE_BITS.get(feature) or _FEATURE_BITS.get(
+            feature.split()[0], 0
+        )
+    return feature_bits
+
+
+def _uses_utf8_paths(encoding):
+    """
+    Return `True` if a session created with the path encoding `encoding` uses
+    UTF-8 for paths, else `False`. `encoding` may be `None` for the default
+    encoding of `ftplib.FTP`.
+    """
+    if encoding is None:
+        return ftputil.path_encoding.RUNNING_UNDER_PY39_AND_UP
+    else:
+        return encoding.lower() in _UTF8_NAMES
+
+
+def _send_opts_utf8_on_if_supported(
+    session, check_feat=True, feature_cache=None, cache_key=None
+):
+    """
+    If the server supports the `UTF8` feature, send "OPTS UTF8 ON".
+
+    If `check_feat` is false, don't ask the server for its features with
+    "FEAT", but send "OPTS UTF8 ON" right away and ignore an error response.
+    This saves a round trip.
+
+    If `feature_cache` is a dictionary, use it to look up the features for
+    `cache_key` and only send "FEAT" if they aren't known yet.
+
+    If the server rejects "OPTS UTF8 ON" although its features contain `UTF8`,
+    ignore the error and store the features without `UTF8` in the cache, so
+    that later sessions don't send the command again.
+
+    See https://datatracker.ietf.org/doc/html/rfc2640.html .
+    """
+    if not check_feat:
+        try:
+            # Some servers respond with "202 UTF8 mode is always enabled".
+            # Since this is a 2xx code, `sendcmd` accepts it.
+            session.sendcmd("OPTS UTF8 ON")
+        except _OPTS_UTF8_ON_ERRORS:
+            # The server doesn't support the command or the option.
+            pass
+        return
+    if (feature_cache is not None) and (cache_key in feature_cache):
+        feature_bits = feature_cache[cache_key]
+    else:
+        feature_bits = _feature_bits(session.sendcmd("FEAT"))
+    utf8_bit = _FEATURE_BITS["UTF8"]
+    if feature_bits & utf8_bit:
+        try:
+            session.sendcmd("OPTS UTF8 ON")
+        except _OPTS_UTF8_ON_ERRORS:
+            # The server lists the feature, but doesn't accept the option, or
+            # the cached features don't apply to this server, for example
+            # because a proxy forwards to another server.
+            feature_bits &= ~utf8_bit
+    if feature_cache is not None:
+        feature_cache[cache_key] = feature_bits
+
+
+def _set_tcp_nodelay(session):
+    """
+    Disable the Nagle algorithm for the command channel of the connected
+    `session`.
+
+    Logging in and setting up a session consists of many small commands, each
+    waiting for the server's response. Don't let the TCP stack delay these
+    commands.
+    """
+    sock = getattr(session, "sock", None)
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError:
+        # Not a TCP socket or the option isn't supported. The session works
+        # anyway, so ignore the error.
+        pass
+
+
 def _maybe_send_opts_utf8_on(session, encoding):
     """
     If the requested encoding is UTF-8 and the server supports the `UTF8`
     feature, send "OPTS UTF8 ON".
+    """
+    if _uses_utf8_paths(encoding):
+        _send_opts_utf8_on_if_supported(session)
 
-    See https://datatracker.ietf.org/doc/html/rfc2640.html .
+
+# Settings for the session classes created by `session_factory`
+_SessionConfig = collections.namedtuple(
+    "_SessionConfig",
+    "port use_passive_mode encoding debug_level encrypt_data_channel uses_utf8_paths "
+    "check_feat tcp_nodelay",
+)
+
+
+class _SessionMixin:
     """
-    if ((encoding is None) and ftputil.path_encoding.RUNNING_UNDER_PY39_AND_UP) or (
-        encoding in ["UTF-8", "UTF8", "utf-8", "utf8"]
-    ):
-        feat_output = session.sendcmd("FEAT")
-        server_supports_opts_utf8_on = False
-        for line in feat_output.splitlines():
-            # The leading space is important. See RFC 2640.
-            if line.upper().rstrip() == " UTF8":
-                server_supports_opts_utf8_on = True
-        if server_supports_opts_utf8_on:
-            session.sendcmd("OPTS UTF8 ON")
+    Mixin for the session classes created by `session_factory`.
+
+    The settings are taken from the class attribute `_session_config`, a
+    `_SessionConfig` object.
+    """
+
+    # In Python 3.8 and below, the `encoding` class attribute was never
+    # documented, but setting it is the only way to set a custom encoding for
+    # remote file system paths. Since we set the encoding on the class level,
+    # all instances created from this class will share this encoding. That's
+    # ok because the user asked for a specific encoding of the _factory_ when
+    # calling `session_factory`.
+    #
+    # Python 3.9 is the first Python version to have a documented way to set a
+    # custom encoding (per instance).
+    #
+    # XXX: The following heuristic doesn't cover the case that we run under
+    # Python 3.8 or earlier _and_ have a base class with an `encoding`
+    # argument. Also, the heuristic will fail if we run under Python 3.9, but
+    # have a base class that overrides the constructor so that it doesn't
+    # support the `encoding` argument anymore.
+    def __init__(self, host, user, password):
+        config = self._session_config
+        encoding = config.encoding
+        if (encoding is not None) and ftputil.path_encoding.RUNNING_UNDER_PY39_AND_UP:
+            super().__init__(encoding=encoding)
+        else:
+            super().__init__()
+        self.connect(host, config.port)
+        if config.tcp_nodelay:
+            _set_tcp_nodelay(self)
+        if config.debug_level is not None:
+            self.set_debuglevel(config.debug_level)
+        self.login(user, password)
+        # `set_pasv` can be called with `True` (causing passive mode) or
+        # `False` (causing active mode).
+        if config.use_passive_mode is not None:
+            self.set_pasv(config.use_passive_mode)
+        if config.encrypt_data_channel:
+            self.prot_p()
+        if config.uses_utf8_paths:
+            _send_opts_utf8_on_if_supported(
+                self,
+                check_feat=config.check_feat,
+                feature_cache=self._feature_cache,
+                cache_key=(host, config.port, user),
+            )
 
 
 # In a way, it would be appropriate to call this function
@@ -46,6 +214,8 @@ def session_factory(
     encrypt_data_channel=True,
     encoding=None,
     debug_level=None,
+    fast_utf8=False,
+    tcp_nodelay=True,
 ):
     """
     Create and return a session factory according to the keyword arguments.
@@ -82,10 +252,28 @@ def session_factory(
     debug_level: Debug level (integer) to be set on a session instance. The
     default is `None`, meaning no debugging output.
 
+    fast_utf8: If `True`, send "OPTS UTF8 ON" without checking the server's
+    `FEAT` output first. The default is `False`, i. e. only send "OPTS UTF8
+    ON" if the server lists the `UTF8` feature. The features are cached per
+    session factory class by host, port and user, so `FEAT` is only sent for
+    the first session and `fast_utf8` saves only this one round trip, but may
+    send a command the server doesn't know. An error response for "OPTS UTF8
+    ON" is ignored in either case. The command is only sent at all if the path
+    encoding is UTF-8.
+
+    tcp_nodelay: If `True` (the default), set the `TCP_NODELAY` option on the
+    command channel socket after connecting, so that the small commands during
+    login aren't delayed by the TCP stack. If `False`, leave the socket
+    options alone.
+
     This function should work for the base classes `ftplib.FTP`,
     `ftplib.FTP_TLS`. Other base classes should work if they use the same API
     as `ftplib.FTP`.
 
+    Calls with the same arguments return the same session factory class. This
+    class is shared by all callers, so don't set attributes on it or change it
+    otherwise. Derive a class from it instead.
+
     Usage example:
 
       my_session_factory = session_factory(
@@ -103,46 +291,63 @@ def session_factory(
             f"`encoding` is only supported for `ftplib.FTP` and subclasses, "
             f"but base class is {base_class!r}"
         )
+    return _session_class(
+        base_class,
+        port,
+        use_passive_mode,
+        encrypt_data_channel,
+        encoding,
+        debug_level,
+        fast_utf8,
+        tcp_nodelay,
+    )
 
-    class Session(base_class):
-        """
-        Session factory class created by `session_factory`.
-        """
-
-        # In Python 3.8 and below, the `encoding` class attribute was never
-        # documented, but setting it is the only way to set a custom encoding
-        # for remote file system paths. Since we set the encoding on the class
-        # level, all instances created from this class will share this
-        # encoding. That's ok because the user asked for a specific encoding of
-        # the _factory_ when calling `session_factory`.
-        #
-        # Python 3.9 is the first Python version to have a documented way to
-        # set a custom encoding (per instance).
-        #
-        # XXX: The following heuristic doesn't cover the case that we run under
-        # Python 3.8 or earlier _and_ have a base class with an `encoding`
-        # argument. Also, the heuristic will fail if we run under Python 3.9,
-        # but have a base class that overrides the constructor so that it
-        # doesn't support the `encoding` argument anymore.
-        def __init__(self, host, user, password):
-            if (
-                encoding is not None
-            ) and ftputil.path_encoding.RUNNING_UNDER_PY39_AND_UP:
-                super().__init__(encoding=encoding)
-            else:
-                super().__init__()
-            self.connect(host, port)
-            if debug_level is not None:
-                self.set_debuglevel(debug_level)
-            self.login(user, password)
-            # `set_pasv` can be called with `True` (causing passive mode) or
-            # `False` (causing active mode).
-            if use_passive_mode is not None:
-                self.set_pasv(use_passive_mode)
-            if encrypt_data_channel and hasattr(base_class, "prot_p"):
-                self.prot_p()
-            _maybe_send_opts_utf8_on(self, encoding)
 
+# Users may create session factories with the same arguments over and over
+# again, for example from a configuration. Reuse the class in this case.
+@functools.lru_cache(maxsize=128)
+def _session_class(
+    base_class,
+    port,
+    use_passive_mode,
+    encrypt_data_channel,
+    encoding,
+    debug_level,
+    fast_utf8,
+    tcp_nodelay,
+):
+    """
+    Return a session factory class for the arguments, which have the same
+    meaning as for `session_factory`. The arguments must have been checked by
+    the caller.
+    """
+    config = _SessionConfig(
+        port=port,
+        use_passive_mode=use_passive_mode,
+        encoding=encoding,
+        debug_level=debug_level,
+        # `base_class` doesn't change, so decide once per factory, not once per
+        # session, whether to call `prot_p`.
+        encrypt_data_channel=bool(encrypt_data_channel)
+        and hasattr(base_class, "prot_p"),
+        # Decide once per factory whether "OPTS UTF8 ON" may be needed.
+        uses_utf8_paths=_uses_utf8_paths(encoding),
+        check_feat=not fast_utf8,
+        tcp_nodelay=tcp_nodelay,
+    )
+    namespace = {
+        "__doc__": "Session factory class created by `session_factory`.",
+        "__module__": __name__,
+        "_session_config": config,
+        # Server features from the `FEAT` command by host name, port and
+        # user. The features of a server are the same for all sessions to it,
+        # so we need to send `FEAT` only for the first session, not for every
+        # opened remote file. The user is part of the key because a proxy may
+        # select the actual server by the user name (as in "user@server").
+        "_feature_cache": {},
+    }
+    # The mixin must come first so that its `__init__` is used.
+    session_class = type("Session", (_SessionMixin, base_class), namespace)
     if (encoding is not None) and not ftputil.path_encoding.RUNNING_UNDER_PY39_AND_UP:
-        Session.encoding = encoding
-    return Session
+        session_class.encoding = encoding
+    return session_class
@@ -6,9 +6,9 @@
 ftputil.stat - stat result, parsers, and FTP stat'ing for `ftputil`
 """
 
+import calendar
 import datetime
-import math
-import re
+import itertools
 import stat
 
 import ftputil.error
@@ -25,6 +25,86 @@ DAY_PRECISION = 24 * 60 * 60
 UNKNOWN_PRECISION = None
 
 
+# Maximum number of links `_Stat._real_stat` follows for one path. Like
+# `ELOOP` for local file systems, longer chains are considered an error.
+_MAX_SYMLINK_DEPTH = 40
+
+
+# Map the file type character of a Unix mode string to the `st_mode` bits.
+_FILE_TYPE_TO_MODE = {
+    "b": stat.S_IFBLK,
+    "c": stat.S_IFCHR,
+    "d": stat.S_IFDIR,
+    "l": stat.S_IFLNK,
+    "p": stat.S_IFIFO,
+    "s": stat.S_IFSOCK,
+    "-": stat.S_IFREG,
+    # Ignore types which `ls` can't make sense of (assuming the FTP server
+    # returns listings like `ls` does).
+    "?": 0,
+}
+
+
+# Translation table to turn a permission string into a string of binary digits:
+# "-" becomes "0", any other ASCII character becomes "1".
+_PERMISSION_DIGITS = {code: "1" for code in range(128)}
+_PERMISSION_DIGITS[ord("-")] = "0"
+
+
+def _permission_bits(permission_string):
+    """
+    Return the `st_mode` permission bits for a nine-character permission
+    string like "rwxr-xr-x".
+    """
+    # TODO: Add support for "S" and sticky bit ("t", "T").
+    # `int` would accept surrounding whitespace and non-ASCII digits, so use
+    # the translation only for strings it turns into exactly nine binary
+    # digits.
+    if permission_string.isascii() and len(permission_string) == 9:
+        st_mode = int(permission_string.translate(_PERMISSION_DIGITS), 2)
+    else:
+        st_mode = 0
+        for bit in permission_string:
+            bit = bit != "-"
+            st_mode = (st_mode << 1) + bit
+    if permission_string[2] == "s":
+        st_mode = st_mode | stat.S_ISUID
+    if permission_string[5] == "s":
+        st_mode = st_mode | stat.S_ISGID
+    return st_mode
+
+
+# Permission bits for all permission strings `ls` usually emits, so that
+# `Parser.parse_unix_mode` needs only a dictionary lookup in the common case.
+_PERMISSION_BITS = {
+    permission_string: _permission_bits(permission_string)
+    for permission_string in map(
+        "".join,
+        itertools.product("-r", "-w", "-xsS", "-r", "-w", "-xsS", "-r", "-w", "-xtT"),
+    )
+}
+
+
+class _TupleItem:
+    """
+    Descriptor to read the item with the index `index` of a tuple.
+
+    This is a non-data descriptor, so assigning the attribute on an instance
+    stores the value in the instance dictionary, which is then found before
+    the descriptor.
+    """
+
+    __slots__ = ("_index",)
+
+    def __init__(self, index):
+        self._index = index
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance[self._index]
+
+
 class StatResult(tuple):
     """
     Support class resembling a tuple like that returned from `os.(l)stat`.
@@ -45,6 +125,9 @@ class StatResult(tuple):
         "_st_target": 11,
     }
 
+    # "Inverted" `_index_mapping` to look up the names for the tuple indices
+    _index_to_name = {index: name for name, index in _index_mapping.items()}
+
     def __init__(self, sequence):
         # Don't call `__init__` via `super`. Construction from a sequence is
         # implicitly handled by `tuple.__new__`, not `tuple.__init__`.
@@ -58,18 +141,23 @@ class StatResult(tuple):
         self._st_target = None
         self._st_mtime_precision = UNKNOWN_PRECISION
 
-    def __getattr__(self, attr_name):
-        if attr_name in self._index_mapping:
-            return self[self._index_mapping[attr_name]]
-        else:
-            raise AttributeError(
-                "'StatResult' object has no attribute '{}'".format(attr_name)
-            )
+    # Access the tuple items via descriptors instead of a `__getattr__` method,
+    # which would only be called after a failed attribute lookup. Unlike
+    # properties, the descriptors allow assigning the attributes, as client
+    # code and custom parsers may do.
+    st_mode = _TupleItem(0)
+    st_ino = _TupleItem(1)
+    st_dev = _TupleItem(2)
+    st_nlink = _TupleItem(3)
+    st_uid = _TupleItem(4)
+    st_gid = _TupleItem(5)
+    st_size = _TupleItem(6)
+    st_atime = _TupleItem(7)
+    st_mtime = _TupleItem(8)
+    st_ctime = _TupleItem(9)
 
     def __repr__(self):
-        # "Invert" `_index_mapping` so that we can look up the names for the
-        # tuple indices.
-        index_to_name = dict((v, k) for k, v in self._index_mapping.items())
+        index_to_name = self._index_to_name
         argument_strings = []
         for index, item in enumerate(self):
             argument_strings.append("{}={!r}".format(index_to_name[index], item))
@@ -85,23 +173,41 @@ class Parser:
     formats inherit from this class.
     """
 
-    # Map month abbreviations to month numbers.
+    # Map month abbreviations to month numbers. Besides the lowercase
+    # abbreviations, include the capitalized and uppercase spellings, which
+    # are what servers usually send, so that we don't need to lowercase the
+    # abbreviation for each directory line.
     _month_numbers = {
-        "jan": 1,
-        "feb": 2,
-        "mar": 3,
-        "apr": 4,
-        "may": 5,
-        "jun": 6,
-        "jul": 7,
-        "aug": 8,
-        "sep": 9,
-        "oct": 10,
-        "nov": 11,
-        "dec": 12,
+        spelling: month_number
+        for month_number, abbreviation in enumerate(
+            [
+                "jan",
+                "feb",
+                "mar",
+                "apr",
+                "may",
+                "jun",
+                "jul",
+                "aug",
+                "sep",
+                "oct",
+                "nov",
+                "dec",
+            ],
+            start=1,
+        )
+        for spelling in [abbreviation, abbreviation.capitalize(), abbreviation.upper()]
     }
 
-    _total_regex = re.compile(r"^total\s+\d+")
+    # Current UTC time as a `datetime.datetime` object or `None`. If set,
+    # `parse_unix_time` uses this value instead of determining the current
+    # time for each line. This is set by `ftputil` for the lines of a single
+    # directory listing and shouldn't be used by custom parsers.
+    _utc_now = None
+
+    # Maximum number of cached results of `parse_unix_time` and
+    # `parse_ms_time`
+    _TIME_CACHE_SIZE = 4096
 
     def ignores_line(self, line):
         """
@@ -116,9 +222,14 @@ class Parser:
         if not line.strip():
             # Yes, ignore the line if it's empty.
             return True
-        # Either a `_SRE_Match` instance or `None`
-        match = self._total_regex.search(line)
-        return bool(match)
+        # Ignore lines like "total 23". This is the same as matching the
+        # regular expression `^total\s+\d+`, but faster.
+        if line.startswith("total"):
+            after_total = line[5:]
+            number_and_rest = after_total.lstrip()
+            has_separator = len(number_and_rest) < len(after_total)
+            return has_separator and number_and_rest[:1].isdecimal()
+        return False
 
     def parse_line(self, line, time_shift=0.0):
         """
@@ -134,6 +245,20 @@ class Parser:
         """
         raise NotImplementedError("must be defined by subclass")
 
+    def parse_name(self, line):
+        """
+        Return the name of the directory entry described by the string `line`.
+
+        If the given text line can't be parsed, raise a `ParserError`.
+
+        This method is used to list a directory if the stat cache is disabled,
+        so that only the names and not the complete stat results are needed.
+        The implementation in this class uses `parse_line`. Derived classes
+        can override this method with a faster implementation.
+        """
+        # pylint: disable=protected-access
+        return self.parse_line(line)._st_name
+
     #
     # Helper methods for parts of a directory listing line
     #
@@ -151,30 +276,13 @@ class Parser:
             raise ftputil.error.ParserError(
                 "invalid mode string '{}'".format(mode_string)
             )
-        st_mode = 0
-        # TODO: Add support for "S" and sticky bit ("t", "T").
-        for bit in mode_string[1:10]:
-            bit = bit != "-"
-            st_mode = (st_mode << 1) + bit
-        if mode_string[3] == "s":
-            st_mode = st_mode | stat.S_ISUID
-        if mode_string[6] == "s":
-            st_mode = st_mode | stat.S_ISGID
-        file_type_to_mode = {
-            "b": stat.S_IFBLK,
-            "c": stat.S_IFCHR,
-            "d": stat.S_IFDIR,
-            "l": stat.S_IFLNK,
-            "p": stat.S_IFIFO,
-            "s": stat.S_IFSOCK,
-            "-": stat.S_IFREG,
-            # Ignore types which `ls` can't make sense of (assuming the FTP
-            # server returns listings like `ls` does).
-            "?": 0,
-        }
+        permission_string = mode_string[1:10]
+        st_mode = _PERMISSION_BITS.get(permission_string)
+        if st_mode is None:
+            st_mode = _permission_bits(permission_string)
         file_type = mode_string[0]
-        if file_type in file_type_to_mode:
-            st_mode = st_mode | file_type_to_mode[file_type]
+        if file_type in _FILE_TYPE_TO_MODE:
+            st_mode = st_mode | _FILE_TYPE_TO_MODE[file_type]
         else:
             raise ftputil.error.ParserError(
                 "unknown file type character '{}'".format(file_type)
@@ -219,6 +327,51 @@ class Parser:
                 "invalid datetime {0!r}".format(invalid_datetime)
             )
 
+    def _timestamp(self, year, month, day, hour, minute):
+        """
+        Return the timestamp (seconds since the epoch, as an integer) for the
+        UTC datetime given by year, month, day, hour and minute.
+
+        If there are invalid values, for example minute > 59, raise a
+        `ParserError`.
+        """
+        # `calendar.timegm` doesn't check its arguments, so check them here.
+        # Leave the error handling to `_datetime`.
+        if not (
+            (datetime.MINYEAR <= year <= datetime.MAXYEAR)
+            and (1 <= month <= 12)
+            and (1 <= day <= 28 or 1 <= day <= calendar.monthrange(year, month)[1])
+            and (0 <= hour <= 23)
+            and (0 <= minute <= 59)
+        ):
+            self._datetime(year, month, day, hour, minute, 0)
+        return calendar.timegm((year, month, day, hour, minute, 0))
+
+    def _cached_time(self, cache_key, parse_function, *args):
+        """
+        Return the tuple `(st_mtime, st_mtime_precision)` stored under
+        `cache_key` in the time cache of this parser. If there's no such
+        entry, call `parse_function(*args)` and store and return its result.
+
+        Usually, many entries of a directory listing share the same time
+        strings, so most calls shouldn't need to parse anything.
+        """
+        try:
+            cache = self._time_cache
+        except AttributeError:
+            # The cache is created lazily so that derived classes don't need
+            # to call `Parser.__init__`.
+            # pylint: disable=attribute-defined-outside-init
+            cache = self._time_cache = {}
+        try:
+            return cache[cache_key]
+        except KeyError:
+            result = parse_function(*args)
+            if len(cache) >= self._TIME_CACHE_SIZE:
+                cache.clear()
+            cache[cache_key] = result
+            return result
+
     def parse_unix_time(
         self, month_abbreviation, day, year_or_time, time_shift, with_precision=False
     ):
@@ -249,18 +402,65 @@ class Parser:
         If this method can't make sense of the given arguments, it raises an
         `ftputil.error.ParserError`.
         """
-        try:
-            month = self._month_numbers[month_abbreviation.lower()]
-        except KeyError:
+        year_is_known = ":" not in year_or_time
+        if year_is_known:
+            server_now = None
+        else:
+            utc_now = self._utc_now
+            if utc_now is None:
+                utc_now = datetime.datetime.now(datetime.timezone.utc)
+            if time_shift:
+                server_now = utc_now + datetime.timedelta(seconds=time_shift)
+            else:
+                # Common case, no need to create a `timedelta` object.
+                server_now = utc_now
+        # If the year isn't known, the result depends on the current server
+        # time, but only to the minute (see `_parse_unix_time`).
+        cache_key = (
+            "unix",
+            month_abbreviation,
+            day,
+            year_or_time,
+            time_shift,
+            None if server_now is None else server_now.replace(second=0, microsecond=0),
+        )
+        st_mtime, st_mtime_precision = self._cached_time(
+            cache_key,
+            self._parse_unix_time,
+            month_abbreviation,
+            day,
+            year_or_time,
+            time_shift,
+            server_now,
+        )
+        if with_precision:
+            return st_mtime, st_mtime_precision
+        else:
+            return st_mtime
+
+    def _parse_unix_time(
+        self, month_abbreviation, day, year_or_time, time_shift, server_now
+    ):
+        """
+        Return a tuple of `st_mtime` and its precision for `parse_unix_time`.
+
+        `server_now` is the current time on the server as a `datetime.datetime`
+        object if `year_or_time` is a time, else `None`.
+        """
+        month = self._month_numbers.get(month_abbreviation)
+        if month is None:
+            # Unusual spelling, for example "jAN"
+            month = self._month_numbers.get(month_abbreviation.lower())
+        if month is None:
             raise ftputil.error.ParserError(
                 "invalid month abbreviation {0!r}".format(month_abbreviation)
             )
         day = self._as_int(day, "day")
-        year_is_known = ":" not in year_or_time
-        if year_is_known:
+        if server_now is None:
             # `year_or_time` is really a year.
             st_mtime_precision = DAY_PRECISION
             server_year, hour, minute = self._as_int(year_or_time, "year"), 0, 0
+            server_timestamp = self._timestamp(server_year, month, day, hour, minute)
         else:
             # `year_or_time` is a time hh:mm.
             st_mtime_precision = MINUTE_PRECISION
@@ -271,9 +471,6 @@ class Parser:
                 self._as_int(minute, "minute"),
             )
             # First assume the year of the directory/file is the current year.
-            server_now = datetime.datetime.now(
-                datetime.timezone.utc
-            ) + datetime.timedelta(seconds=time_shift)
             server_year = server_now.year
             # If the server datetime derived from this year seems to be in the
             # future, subtract one year.
@@ -296,29 +493,28 @@ class Parser:
             # Hence, add a small time difference that must be exceeded in order
             # to assume the time is in the future. This time difference is
             # arbitrary, but we have to assume _some_ value.
-            if self._datetime(
-                server_year, month, day, hour, minute, 0
-            ) > server_now.replace(second=0) + datetime.timedelta(seconds=120):
+            #
+            # Compare timestamps, not `datetime` objects, so that we don't need
+            # to construct another `datetime` object.
+            server_timestamp = self._timestamp(server_year, month, day, hour, minute)
+            server_now_timestamp = calendar.timegm(server_now.timetuple()) // 60 * 60
+            if server_timestamp > server_now_timestamp + 120:
                 server_year -= 1
+                server_timestamp = self._timestamp(
+                    server_year, month, day, hour, minute
+                )
         # The time shift is the time difference the server is ahead of UTC. So
         # to get back to UTC, subtract the time shift. The calculation is
         # supposed to be the same for negative time shifts; in this case we
         # subtract a negative time shift, i. e. add the absolute value of the
         # time shift to the server date time.
-        server_utc_datetime = self._datetime(
-            server_year, month, day, hour, minute, 0
-        ) - datetime.timedelta(seconds=time_shift)
-        st_mtime = server_utc_datetime.timestamp()
+        st_mtime = float(server_timestamp - time_shift)
         # If we had a datetime before the epoch, the resulting value 0.0
         # doesn't tell us anything about the precision.
         if st_mtime < 0.0:
             st_mtime_precision = UNKNOWN_PRECISION
             st_mtime = 0.0
-        #
-        if with_precision:
-            return st_mtime, st_mtime_precision
-        else:
-            return st_mtime
+        return st_mtime, st_mtime_precision
 
     def parse_ms_time(self, date, time_, time_shift, with_precision=False):
         """
@@ -363,6 +559,22 @@ class Parser:
         # minute and can be set in `MSParser.parse_line`. Should you find
         # yourself needing support for `with_precision` for a derived class,
         # please send a mail (see ftputil.txt/html).
+        st_mtime, st_mtime_precision = self._cached_time(
+            ("ms", date, time_, time_shift),
+            self._parse_ms_time,
+            date,
+            time_,
+            time_shift,
+        )
+        if with_precision:
+            return st_mtime, st_mtime_precision
+        else:
+            return st_mtime
+
+    def _parse_ms_time(self, date, time_, time_shift):
+        """
+        Return a tuple of `st_mtime` and its precision for `parse_ms_time`.
+        """
         month, day, year = [
             self._as_int(part, "year/month/day") for part in date.split("-")
         ]
@@ -382,18 +594,13 @@ class Parser:
             hour = 0
         if hour != 12 and am_pm == "P":
             hour += 12
-        server_datetime = self._datetime(year, month, day, hour, minute, 0)
-        client_datetime = server_datetime - datetime.timedelta(seconds=time_shift)
-        st_mtime = client_datetime.timestamp()
+        st_mtime = float(self._timestamp(year, month, day, hour, minute) - time_shift)
         if st_mtime < 0.0:
             st_mtime_precision = UNKNOWN_PRECISION
             st_mtime = 0.0
         else:
             st_mtime_precision = MINUTE_PRECISION
-        if with_precision:
-            return st_mtime, st_mtime_precision
-        else:
-            return st_mtime
+        return st_mtime, st_mtime_precision
 
 
 class UnixParser(Parser):
@@ -411,9 +618,11 @@ class UnixParser(Parser):
         """
         # This method encapsulates the recognition of an unusual Unix format
         # variant (see ticket http://ftputil.sschwarzer.net/trac/ticket/12 ).
-        line_parts = line.split()
         FIELD_COUNT_WITHOUT_USERID = 8
         FIELD_COUNT_WITH_USERID = FIELD_COUNT_WITHOUT_USERID + 1
+        # Split for the usual format (with user id field) right away. Only
+        # the unusual format needs a second split.
+        line_parts = line.split(None, FIELD_COUNT_WITH_USERID - 1)
         if len(line_parts) < FIELD_COUNT_WITHOUT_USERID:
             # No known Unix-style format
             raise ftputil.error.ParserError("line '{}' can't be parsed".format(line))
@@ -423,7 +632,7 @@ class UnixParser(Parser):
             int(line_parts[5])
         except ValueError:
             # Month abbreviation, "invalid literal for int"
-            line_parts = line.split(None, FIELD_COUNT_WITH_USERID - 1)
+            pass
         else:
             # Day
             line_parts = line.split(None, FIELD_COUNT_WITHOUT_USERID - 1)
@@ -431,6 +640,45 @@ class UnixParser(Parser):
             line_parts.insert(USER_FIELD_INDEX, None)
         return line_parts
 
+    @staticmethod
+    def _split_name(name):
+        """
+        Return a tuple of the entry name and the link target for the `name`
+        field of a directory line. If the entry isn't a link, the target is
+        `None`.
+        """
+        arrow_count = name.count(" -> ")
+        if arrow_count > 1:
+            # If we have more than one arrow we can't tell where the link name
+            # ends and the target name starts.
+            raise ftputil.error.ParserError(
+                '''name '{}' contains more than one "->"'''.format(name)
+            )
+        elif arrow_count == 1:
+            st_name, st_target = name.split(" -> ")
+            return st_name, st_target
+        else:
+            return name, None
+
+    def parse_name(self, line):
+        """
+        Return the name of the directory entry described by `line`, without
+        parsing the other fields except for the mode string.
+
+        If the line can't be parsed, raise a `ParserError`.
+        """
+        # Don't bypass a `parse_line` method overridden in a derived class.
+        if type(self).parse_line is not UnixParser.parse_line:
+            return super().parse_name(line)
+        try:
+            mode_string, _, _, _, _, _, _, _, name = self._split_line(line)
+        except ValueError as exc:
+            raise ftputil.error.ParserError(str(exc))
+        # Check the mode string, so that we still notice if the line isn't in
+        # Unix format.
+        self.parse_unix_mode(mode_string)
+        return self._split_name(name)[0]
+
     def parse_line(self, line, time_shift=0.0):
         """
         Return a `StatResult` instance corresponding to the given text line.
@@ -458,45 +706,23 @@ class UnixParser(Parser):
         # exception the docstring mentions.
         except ValueError as exc:
             raise ftputil.error.ParserError(str(exc))
-        # st_mode
         st_mode = self.parse_unix_mode(mode_string)
-        # st_ino, st_dev, st_nlink, st_uid, st_gid, st_size, st_atime
-        st_ino = None
-        st_dev = None
-        st_nlink = int(nlink)
-        st_uid = user
-        st_gid = group
-        st_size = int(size)
-        st_atime = None
-        # st_mtime
         st_mtime, st_mtime_precision = self.parse_unix_time(
             month, day, year_or_time, time_shift, with_precision=True
         )
-        # st_ctime
-        st_ctime = None
-        # st_name
-        if name.count(" -> ") > 1:
-            # If we have more than one arrow we can't tell where the link name
-            # ends and the target name starts.
-            raise ftputil.error.ParserError(
-                '''name '{}' contains more than one "->"'''.format(name)
-            )
-        elif name.count(" -> ") == 1:
-            st_name, st_target = name.split(" -> ")
-        else:
-            st_name, st_target = name, None
+        st_name, st_target = self._split_name(name)
         stat_result = StatResult(
             (
                 st_mode,
-                st_ino,
-                st_dev,
-                st_nlink,
-                st_uid,
-                st_gid,
-                st_size,
-                st_atime,
+                None,  # st_ino
+                None,  # st_dev
+                int(nlink),
+                user,
+                group,
+                int(size),
+                None,  # st_atime
                 st_mtime,
-                st_ctime,
+                None,  # st_ctime
             )
         )
         # These attributes are kind of "half-official". I'm not sure whether
@@ -513,6 +739,23 @@ class MSParser(Parser):
     `Parser` class for MS-specific directory format.
     """
 
+    def parse_name(self, line):
+        """
+        Return the name of the directory entry described by `line`, without
+        parsing the other fields.
+
+        If the line can't be parsed, raise a `ParserError`.
+        """
+        # Don't bypass a `parse_line` method overridden in a derived class.
+        if type(self).parse_line is not MSParser.parse_line:
+            return super().parse_name(line)
+        try:
+            _date, _time, _dir_or_size, name = line.split(None, 3)
+        except ValueError:
+            # "unpack list of wrong size"
+            raise ftputil.error.ParserError("line '{}' can't be parsed".format(line))
+        return name
+
     def parse_line(self, line, time_shift=0.0):
         """
         Return a `StatResult` instance corresponding to the given text line
@@ -537,12 +780,6 @@ class MSParser(Parser):
             st_mode = st_mode | stat.S_IFDIR
         else:
             st_mode = st_mode | stat.S_IFREG
-        # st_ino, st_dev, st_nlink, st_uid, st_gid
-        st_ino = None
-        st_dev = None
-        st_nlink = None
-        st_uid = None
-        st_gid = None
         # st_size
         if dir_or_size != "<DIR>":
             try:
@@ -551,27 +788,13 @@ class MSParser(Parser):
                 raise ftputil.error.ParserError("invalid size {}".format(dir_or_size))
         else:
             st_size = None
-        # st_atime
-        st_atime = None
         # st_mtime
         st_mtime, st_mtime_precision = self.parse_ms_time(
             date, time_, time_shift, with_precision=True
         )
-        # st_ctime
-        st_ctime = None
+        # Besides mode, size and mtime, the fields are `None`.
         stat_result = StatResult(
-            (
-                st_mode,
-                st_ino,
-                st_dev,
-                st_nlink,
-                st_uid,
-                st_gid,
-                st_size,
-                st_atime,
-                st_mtime,
-                st_ctime,
-            )
+            (st_mode, None, None, None, None, None, st_size, None, st_mtime, None)
         )
         # These attributes are kind of "half-official". I'm not sure whether
         # they should be used by ftputil client code.
@@ -622,25 +845,59 @@ class _Stat:
         # is the "low-level" `LRUCache` object.
         cache = self._lstat_cache
         # Auto-grow cache if the cache up to now can't hold as many entries as
-        # there are in the directory `path`.
+        # there are in the directory `path`. Grow at least by a factor of two,
+        # so that a series of slightly larger directories doesn't cause a
+        # resize for each of them.
         if cache._enabled and len(lines) >= cache._cache.size:
-            new_size = int(math.ceil(1.1 * len(lines)))
+            new_size = max(2 * cache._cache.size, len(lines) + 16)
             cache.resize(new_size)
-        # Yield stat results from lines.
-        for line in lines:
-            if self._parser.ignores_line(line):
-                continue
-            # Although for a `listdir` call we're only interested in the names,
-            # use the `time_shift` parameter to store the correct timestamp
-            # values in the cache.
-            stat_result = self._parser.parse_line(line, self._host.time_shift())
-            # Skip entries "." and "..".
-            if stat_result._st_name in [self._host.curdir, self._host.pardir]:
+        # Although for a `listdir` call we're only interested in the names,
+        # use the `time_shift` parameter to store the correct timestamp values
+        # in the cache.
+        time_shift = self._host.time_shift()
+        parser = self._parser
+        # Use the same "current time" for all lines of the listing instead of
+        # determining it again for each line.
+        parser._utc_now = datetime.datetime.now(datetime.timezone.utc)
+        # Avoid attribute lookups in the loop.
+        ignores_line = parser.ignores_line
+        parse_line = parser.parse_line
+        special_names = (self._host.curdir, self._host.pardir)
+        join = self._path.join
+        try:
+            # Yield stat results from lines.
+            for line in lines:
+                if ignores_line(line):
+                    continue
+                stat_result = parse_line(line, time_shift)
+                # Skip entries "." and "..".
+                if stat_result._st_name in special_names:
+                    continue
+                loop_path = join(path, stat_result._st_name)
+                # No-op if cache is disabled.
+                cache[loop_path] = stat_result
+                yield stat_result
+        finally:
+            parser._utc_now = None
+
+    def _names_from_dir(self, path):
+        """
+        Yield the names of the entries in the directory listing `path`. Omit
+        the special entries for the directory itself and its parent directory.
+
+        In contrast to `_stat_results_from_dir`, only parse the names and
+        don't store anything in the stat cache.
+        """
+        parser = self._parser
+        ignores_line = parser.ignores_line
+        parse_name = parser.parse_name
+        special_names = (self._host.curdir, self._host.pardir)
+        for line in self._host_dir(path):
+            if ignores_line(line):
                 continue
-            loop_path = self._path.join(path, stat_result._st_name)
-            # No-op if cache is disabled.
-            cache[loop_path] = stat_result
-            yield stat_result
+            name = parse_name(line)
+            if name not in special_names:
+                yield name
 
     # The methods `listdir`, `lstat` and `stat` come in two variants. The
     # methods `_real_listdir`, `_real_lstat` and `_real_stat` use the currently
@@ -681,14 +938,19 @@ class _Stat:
             raise ftputil.error.PermanentError(
                 "550 {}: no such directory or wrong directory parser used".format(path)
             )
-        # Set up for `for` loop.
-        names = []
-        for stat_result in self._stat_results_from_dir(path):
-            st_name = stat_result._st_name
-            names.append(st_name)
-        return names
+        # Although we're only interested in the names, parse the complete lines
+        # to fill the cache for later `stat` calls. Also parse the complete
+        # lines as long as the parser may still be switched, since the parser
+        # detection relies on checking all fields, not only the name.
+        if self._lstat_cache._enabled or self._allow_parser_switching:
+            return [
+                stat_result._st_name
+                for stat_result in self._stat_results_from_dir(path)
+            ]
+        else:
+            return list(self._names_from_dir(path))
 
-    def _real_lstat(self, path, _exception_for_missing_path=True):
+    def _real_lstat(self, path, _exception_for_missing_path=True, _listings=None):
         """
         Return an object similar to that returned by `os.lstat`.
 
@@ -698,8 +960,11 @@ class _Stat:
         containing `path` can't be parsed we get a `ParserError`, independent
         on the presence of `path` on the server.
 
-        (`_exception_for_missing_path` is an implementation aid and _not_
-        intended for use by ftputil clients.)
+        (`_exception_for_missing_path` and `_listings` are implementation aids
+        and _not_ intended for use by ftputil clients. If `_listings` is a
+        dictionary, it maps directory paths to dictionaries of names and
+        lstat results. Directories in it aren't listed again and new listings
+        are added to it.)
         """
         path = self._path.abspath(path)
         # If the path is in the cache, return the lstat result.
@@ -718,18 +983,26 @@ class _Stat:
         # gotten to the root directory.
         if not self._path.isdir(dirname) and not _exception_for_missing_path:
             return None
-        # Loop through all lines of the directory listing. We probably won't
-        # need all lines for the particular path but we want to collect as many
-        # stat results in the cache as possible.
-        lstat_result_for_path = None
-        # FIXME: Here we try to list the contents of `dirname` even though the
-        # above `isdir` call might/could have shown that the directory doesn't
-        # exist. This may be related to ticket #108. That said, we may need to
-        # consider virtual directories here (see tickets #86 / #87).
-        for stat_result in self._stat_results_from_dir(dirname):
+        if _listings is not None and dirname in _listings:
+            lstat_result_for_path = _listings[dirname].get(basename)
+        else:
+            # Loop through all lines of the directory listing. We probably
+            # won't need all lines for the particular path but we want to
+            # collect as many stat results in the cache as possible.
+            #
+            # FIXME: Here we try to list the contents of `dirname` even though
+            # the above `isdir` call might/could have shown that the directory
+            # doesn't exist. This may be related to ticket #108. That said, we
+            # may need to consider virtual directories here (see tickets #86 /
+            # #87).
+            lstat_results = {
+                stat_result._st_name: stat_result
+                for stat_result in self._stat_results_from_dir(dirname)
+            }
+            if _listings is not None:
+                _listings[dirname] = lstat_results
             # Needed to work without cache or with disabled cache.
-            if stat_result._st_name == basename:
-                lstat_result_for_path = stat_result
+            lstat_result_for_path = lstat_results.get(basename)
         if lstat_result_for_path is not None:
             return lstat_result_for_path
         # Path was not found during the loop.
@@ -746,7 +1019,7 @@ class _Stat:
             # between a missing path or a more severe error in the code above.
             return None
 
-    def _real_stat(self, path, _exception_for_missing_path=True):
+    def _real_stat(self, path, _exception_for_missing_path=True, _listings=None):
         """
         Return info from a "stat" call on `path`.
 
@@ -756,16 +1029,32 @@ class _Stat:
         there's an endless (cyclic) chain of symbolic links "behind" the
         `path`.
 
-        (`_exception_for_missing_path` is an implementation aid and _not_
-        intended for use by ftputil clients.)
+        (`_exception_for_missing_path` and `_listings` are implementation aids
+        and _not_ intended for use by ftputil clients. See `_real_lstat` for
+        `_listings`.)
         """
         # Save for error message.
         original_path = path
         # Most code in this method is used to detect recursive link structures.
-        visited_paths = set()
+        # Link chains are usually short (and most paths aren't links at all),
+        # so a list is cheaper than a set here.
+        visited_paths = []
+        # Directory listings retrieved while following the links. If the stat
+        # cache is disabled, this avoids listing the same directory again for
+        # each link in it.
+        if _listings is None:
+            listings = {}
+        else:
+            listings = _listings
+        real_lstat = self._real_lstat
+        split = self._path.split
+        join = self._path.join
+        abspath = self._path.abspath
         while True:
             # Stat the link if it is one, else the file/directory.
-            lstat_result = self._real_lstat(path, _exception_for_missing_path)
+            lstat_result = real_lstat(
+                path, _exception_for_missing_path, _listings=listings
+            )
             if lstat_result is None:
                 return None
             # If the file is not a link, the `stat` result is the same as the
@@ -774,19 +1063,19 @@ class _Stat:
                 return lstat_result
             # If we stat'ed a link, calculate a normalized path for the file
             # the link points to.
-            dirname, _ = self._path.split(path)
-            path = self._path.join(dirname, lstat_result._st_target)
-            path = self._path.abspath(self._path.normpath(path))
-            # Check for cyclic structure.
-            if path in visited_paths:
-                # We had seen this path already.
+            dirname, _ = split(path)
+            # `abspath` also normalizes the path.
+            path = abspath(join(dirname, lstat_result._st_target))
+            # Check for cyclic structure. Don't follow arbitrarily long chains
+            # either.
+            if path in visited_paths or len(visited_paths) >= _MAX_SYMLINK_DEPTH:
+                # We had seen this path already or the chain is too long.
                 raise ftputil.error.RecursiveLinksError(
-                    "recursive link structure detected for remote path '{}'".format(
-                        original_path
-                    )
+                    f"recursive link structure detected for remote path "
+                    f"'{original_path}'"
                 )
             # Remember the path we have encountered.
-            visited_paths.add(path)
+            visited_paths.append(path)
 
     def __call_with_parser_retry(self, method, *args, **kwargs):
         """
@@ -794,6 +1083,9 @@ class _Stat:
         `ParserError` and only one parser has been used yet, try the other
         parser. If that still fails, propagate the `ParserError`.
         """
+        # Once the parser is fixed, there's nothing to check or retry.
+        if not self._allow_parser_switching:
+            return method(*args, **kwargs)
         # Do _not_ set `_allow_parser_switching` in a `finally` clause! This
         # would cause a `PermanentError` due to a not-found file in an empty
         # directory to finally establish the parser - which is wrong.
@@ -845,3 +1137,23 @@ class _Stat:
         return self.__call_with_parser_retry(
             self._real_stat, path, _exception_for_missing_path
         )
+
+    def _stat_many(self, paths, _exception_for_missing_path=True):
+        """
+        Return a list of `StatResult`s for the `paths`, with following links.
+
+        This is equivalent to calling `_stat` for each path, but each
+        directory is listed at most once, even if the stat cache is disabled.
+
+        Raise a `PermanentError` if a path doesn't exist, but maybe raise
+        other exceptions depending on the state of the server (e. g. timeout).
+        """
+        # If the parser is switched for one of the paths, the listings from
+        # before are still valid since they could be parsed.
+        listings = {}
+        return [
+            self.__call_with_parser_retry(
+                self._real_stat, path, _exception_for_missing_path, _listings=listings
+            )
+            for path in paths
+        ]
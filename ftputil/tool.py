@@ -20,7 +20,11 @@ def same_string_type_as(type_source, string, encoding):
     If the `type_source` and `string` don't have the same type, use `encoding`
     to encode or decode, whatever operation is needed.
     """
-    if isinstance(type_source, bytes) and isinstance(string, str):
+    # Fast path for the most common case. The `isinstance` checks below also
+    # handle subclasses of `bytes` and `str`.
+    if type(string) is type(type_source):
+        return string
+    elif isinstance(type_source, bytes) and isinstance(string, str):
         return string.encode(encoding)
     elif isinstance(type_source, str) and isinstance(string, bytes):
         return string.decode(encoding)
@@ -37,7 +41,10 @@ def as_str(string, encoding):
 
     If `string` is neither `str` nor `bytes`, raise a `TypeError`.
     """
-    if isinstance(string, bytes):
+    # Check for the most common case first.
+    if type(string) is str:
+        return string
+    elif isinstance(string, bytes):
         return string.decode(encoding)
     elif isinstance(string, str):
         return string
@@ -58,6 +65,9 @@ def as_str_path(path, encoding):
     If the `path` can't be converted to a `bytes` or `str`, a `TypeError` is
     raised.
     """
+    # Avoid the `os.fspath` call for the most common case.
+    if type(path) is str:
+        return path
     path = os.fspath(path)
     return as_str(path, encoding)
 
@@ -67,13 +77,14 @@ def raise_for_empty_path(path, path_argument_name="path"):
     Raise an exception of class `exception_class` if `path` is an empty string
     (text or bytes).
     """
-    # Avoid cyclic import.
-    import ftputil.error
-
     # Don't handle `pathlib.Path("")`. This immediately results in `Path(".")`,
     # so we can't detect it anyway. Regarding bytes, `Path(b"")` results in a
     # `TypeError`.
     if path in ["", b""]:
+        # Avoid cyclic import. Import only here, so that the usual case of a
+        # non-empty path doesn't need the import statement.
+        import ftputil.error
+
         if path_argument_name is None:
             message = "path argument is empty"
         else:
@@ -2,49 +2,50 @@
 # Copyright (C) 2011, Stefan Schwarzer
 
 import random
-import sys
 import time
 
-import ftp_stat_cache
+import ftputil.stat_cache
 
 
 def print_statistics(task, old_time, new_time):
     """Print how long `task` (a string) took."""
     time_difference = new_time - old_time
-    print "%40s took: %8.3f seconds" % (task, time_difference)
+    print(f"{task:>40} took: {time_difference:8.3f} seconds")
 
 
 def main(max_size, new_entries):
-    cache = ftp_stat_cache.StatCache()
+    cache = ftputil.stat_cache.StatCache()
     cache.resize(max_size)
-    #cache = {}
+    # cache = {}
+    # Create the keys before the measurements, so that the timings show the
+    # cache operations, not the string formatting. The cache checks if
+    # entries start with "/".
+    keys = [f"/{i}" for i in range(max_size + new_entries)]
     # Populate cache until it's full.
+    fill_indices = list(range(max_size))
+    random.shuffle(fill_indices)
     t1 = time.time()
-    L = range(max_size)
-    random.shuffle(L)
-    for i in xrange(max_size):
-        rand = L[i]
-        # The cache checks if entries start with "/".
-        cache["/%d" % rand] = rand
+    for index in fill_indices:
+        cache[keys[index]] = index
     t2 = time.time()
-    print_statistics("Filling cache with %d entries" % max_size, t1, t2)
+    print_statistics(f"Filling cache with {max_size} entries", t1, t2)
     # Read the cache.
-    for i in xrange(max_size):
-        data = cache["/%d" % i]
+    for key in keys[:max_size]:
+        data = cache[key]
     t3 = time.time()
     print_statistics("Reading the cache", t2, t3)
-    # Now that the cache is full, try to add 100 more entries,
-    # implicitly replacing old entries.
-    L = range(new_entries)
-    random.shuffle(L)
-    for i in xrange(new_entries):
-        rand = L[i]
+    # Now that the cache is full, try to add more entries, implicitly
+    # replacing old entries.
+    new_indices = list(range(new_entries))
+    random.shuffle(new_indices)
+    t3 = time.time()
+    for index in new_indices:
         # Make sure to add entries, not replace them.
-        cache["/%d" % (max_size+rand)] = rand
+        cache[keys[max_size + index]] = index
     t4 = time.time()
-    print_statistics("Replacing %d entries" % new_entries, t3, t4)
+    print_statistics(f"Replacing {new_entries} entries", t3, t4)
 
 
-if __name__ == '__main__':
+if __name__ == "__main__":
     test_size = 10000
     main(max_size=test_size, new_entries=test_size)
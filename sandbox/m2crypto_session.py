@@ -38,8 +38,15 @@ class M2CryptoSession(M2Crypto.ftpslib.FTP_TLS):
         are converted to byte strings before being used.
         """
         original_sendall = self.sock.sendall
+        # `ftputil.tool` no longer has an `as_bytes` function. Look up the
+        # conversion function and the session encoding only once, not for
+        # each `sendall` call.
+        same_string_type_as = ftputil.tool.same_string_type_as
+        encoding = self.encoding
         # Bound method, therefore no `self` argument.
         def sendall(data):
-            data = ftputil.tool.as_bytes(data)
+            # Uploaded file data is already `bytes`; only commands are `str`.
+            if type(data) is not bytes:
+                data = same_string_type_as(b"", data, encoding)
             return original_sendall(data)
         self.sock.sendall = sendall
@@ -14,7 +14,8 @@ from distutils import core
 
 _name = "ftputil"
 _package = "ftputil"
-_version = open("VERSION").read().strip()
+with open("VERSION", encoding="utf-8") as fobj:
+    _version = fobj.readline().strip()
 
 
 core.setup(
@@ -2,8 +2,8 @@
 # and ftputil contributors (see `doc/contributors.txt`)
 # See the file LICENSE for licensing terms.
 
+import os
 import sys
-import unittest.mock
 
 import ftputil.path_encoding
 
@@ -11,79 +11,175 @@ import ftputil.path_encoding
 __all__ = ["Call", "factory"]
 
 
+# Print a trace of all scripted calls only if the environment variable
+# `FTPUTIL_SCRIPT_TRACE` is set to "1". Mismatches between the script and the
+# calls from the system under test are always printed.
+_TRACE = os.environ.get("FTPUTIL_SCRIPT_TRACE") == "1"
+
+
+def _is_exception_class(obj):
+    """
+    Return `True` if `obj` is an exception class, else `False`.
+    """
+    return isinstance(obj, type) and issubclass(obj, Exception)
+
+
 class Call:
+    # Scripts can contain many `Call` objects, so avoid a `__dict__` for each.
+    __slots__ = ("method_name", "result", "args", "kwargs", "_raises", "_lines")
+
     def __init__(self, method_name, *, args=None, kwargs=None, result=None):
         self.method_name = method_name
         self.result = result
         self.args = args
         self.kwargs = kwargs
+        # Determine only once whether `__call__` should raise the result.
+        self._raises = isinstance(result, Exception) or _is_exception_class(result)
+        # Lines of a string `result`, split on first access to `lines`
+        self._lines = None
 
     def __repr__(self):
         return (
-            "{0.__class__.__name__}("
-            "method_name={0.method_name!r}, "
-            "result={0.result!r}, "
-            "args={0.args!r}, "
-            "kwargs={0.kwargs!r})".format(self)
+            f"{self.__class__.__name__}("
+            f"method_name={self.method_name!r}, "
+            f"result={self.result!r}, "
+            f"args={self.args!r}, "
+            f"kwargs={self.kwargs!r})"
         )
 
+    @property
+    def lines(self):
+        """
+        Return the lines of the multiline string `result`.
+
+        The string is split only once, even if a `Call` object is used in more
+        than one script.
+        """
+        if self._lines is None:
+            self._lines = self.result.splitlines()
+        return self._lines
+
+    def _print_calls(self, method_name, args, kwargs):
+        """
+        Print the call from the script and the call from the system under
+        test.
+        """
+        print(
+            f"  Call from session script:    "
+            f"{self.method_name} | {self.args!r} | {self.kwargs!r}"
+        )
+        print(f"  Call from system under test: {method_name} | {args!r} | {kwargs!r}")
+
     def check_call(self, method_name, args=None, kwargs=None):
-        # TODO: Mention printing in the docstring.
         # TODO: Describe how the comparison is made.
         """
         Check the method name, args and kwargs from this `Call` object against
         the method name, args and kwargs from the system under test.
 
-        Raise an `AssertionError` if there's a mismatch.
+        Raise an `AssertionError` if there's a mismatch. In this case, print
+        both calls. If tracing is enabled, print them for every check.
         """
-        print(
-            "  Call from session script:    {} | {!r} | {!r}".format(
-                self.method_name, self.args, self.kwargs
-            )
-        )
-        print(
-            "  Call from system under test: {} | {!r} | {!r}".format(
-                method_name, args, kwargs
-            )
-        )
-
-        def compare(value_name, script_value, sut_value):
-            if script_value is not None:
-                try:
-                    assert script_value == sut_value
-                except AssertionError:
-                    print(
-                        "  Mismatch for `{}`: {!r} != {!r}".format(
-                            value_name, script_value, sut_value
-                        )
-                    )
-                    raise
-
-        compare("method_name", self.method_name, method_name)
-        compare("args", self.args, args)
-        compare("kwargs", self.kwargs, kwargs)
-
-    @staticmethod
-    def _is_exception_class(obj):
+        if _TRACE:
+            self._print_calls(method_name, args, kwargs)
+        # Compare inline instead of with a helper function, since this runs
+        # for every call from the system under test. A script value of `None`
+        # matches any value.
+        if (
+            (self.method_name is not None and method_name != self.method_name)
+            or (self.args is not None and args != self.args)
+            or (self.kwargs is not None and kwargs != self.kwargs)
+        ):
+            self._report_mismatch(method_name, args, kwargs)
+
+    def _report_mismatch(self, method_name, args, kwargs):
         """
-        Return `True` if `obj` is an exception class, else `False`.
+        Print the calls and the mismatching values and raise an
+        `AssertionError`.
         """
-        try:
-            return issubclass(obj, Exception)
-        except TypeError:
-            # TypeError: issubclass() arg 1 must be a class
-            return False
+        if not _TRACE:
+            self._print_calls(method_name, args, kwargs)
+        for value_name, script_value, sut_value in [
+            ("method_name", self.method_name, method_name),
+            ("args", self.args, args),
+            ("kwargs", self.kwargs, kwargs),
+        ]:
+            if script_value is not None and script_value != sut_value:
+                print(
+                    f"  Mismatch for `{value_name}`: "
+                    f"{script_value!r} != {sut_value!r}"
+                )
+        raise AssertionError(f"call from system under test doesn't match {self!r}")
 
     def __call__(self):
         """
         Simulate call, returning the result or raising the exception.
         """
-        if isinstance(self.result, Exception) or self._is_exception_class(self.result):
+        if self._raises:
+            raise self.result
+        else:
+            return self.result
+
+    def invoke(self, method_name, args, kwargs):
+        """
+        Check the call from the system under test (see `check_call`), then
+        simulate the call, returning the result or raising the exception.
+        """
+        self.check_call(method_name, args, kwargs)
+        if self._raises:
             raise self.result
         else:
             return self.result
 
 
+class _DataSocket:
+    """
+    Minimal replacement for the data connection socket returned by
+    `ScriptedSession.transfercmd` and `ScriptedSession.ntransfercmd`.
+
+    `makefile` returns the `result` of the `Call` regardless of its arguments.
+    This is much cheaper than setting up a `unittest.mock.Mock` object for
+    each transfer.
+    """
+
+    __slots__ = ("_file",)
+
+    def __init__(self, file):
+        self._file = file
+
+    def makefile(self, *args, **kwargs):
+        return self._file
+
+    def close(self):
+        pass
+
+
+class _ControlSocket:
+    """
+    Minimal replacement for the `sock` attribute of an `ftplib.FTP` object.
+
+    `FTPFile.close` gets and sets the timeout of the control connection
+    socket. Record these calls, so that tests can check them. This is much
+    cheaper than setting up a `unittest.mock.Mock` object for each session.
+    """
+
+    __slots__ = ("_timeout", "gettimeout_count", "settimeout_args")
+
+    def __init__(self):
+        self._timeout = None
+        # Number of `gettimeout` calls
+        self.gettimeout_count = 0
+        # Arguments of the `settimeout` calls, in call order
+        self.settimeout_args = []
+
+    def gettimeout(self):
+        self.gettimeout_count += 1
+        return self._timeout
+
+    def settimeout(self, timeout):
+        self.settimeout_args.append(timeout)
+        self._timeout = timeout
+
+
 class ScriptedSession:
     """
     "Scripted" `ftplib.FTP`-like class for testing.
@@ -106,27 +202,30 @@ class ScriptedSession:
     when specifying return values or side effects for the mock methods.
     """
 
-    # Class-level counter to enumerate `ScriptedSession`s. This makes it
-    # possible to make the output even more compact. Additionally, it's easier
-    # to distinguish numbers like 1, 2, etc. than hexadecimal ids.
-    _session_count = 0
-
     encoding = ftputil.path_encoding.FTPLIB_DEFAULT_ENCODING
 
-    @classmethod
-    def reset_session_count(cls):
-        cls._session_count = 0
-
-    def __init__(self, script):
+    def __init__(self, script, session_number=1):
         self.script = script
         # `File.close` accesses the session `sock` object to set and reset the
         # timeout. `sock` itself is never _called_ though, so it doesn't make
         # sense to create a `sock` _call_.
-        self.sock = unittest.mock.Mock(name="socket_attribute")
-        # Index into `script`, the list of `Call` objects
-        self._call_index = 0
-        self.__class__._session_count += 1
-        self._session_count = self.__class__._session_count
+        self.sock = _ControlSocket()
+        # Iterator over `script`, the list of `Call` objects
+        self._script_calls = iter(script)
+        # Identify the session by the number given by the factory. This makes
+        # the output more compact. Additionally, it's easier to distinguish
+        # numbers like 1, 2, etc. than hexadecimal ids. The string
+        # representation doesn't change, so create it only once.
+        self._str = f"{self.__class__.__name__} {session_number}"
+        # Install a method for each method name in the script, so that the
+        # usual attribute lookup finds it and calls don't need to go through
+        # `__getattr__`. Skip names which the class handles itself (like
+        # `dir`) and `None`, which matches any method name.
+        for method_name in {call.method_name for call in script}:
+            if isinstance(method_name, str) and not hasattr(
+                self.__class__, method_name
+            ):
+                setattr(self, method_name, self._script_method(method_name))
         # Always expect an entry for the constructor.
         init_call = self._next_script_call("__init__")
         # The constructor isn't supposed to return anything. The only reason to
@@ -135,32 +234,47 @@ class ScriptedSession:
         init_call()
 
     def __str__(self):
-        return "{} {}".format(self.__class__.__name__, self._session_count)
+        return self._str
 
     def _next_script_call(self, requested_attribute):
         """
         Return next `Call` object.
         """
-        print(self, "in `_next_script_call`")
-        try:
-            call = self.script[self._call_index]
-        except IndexError:
-            print("  *** Ran out of `Call` objects for this session {!r}".format(self))
-            print("  Requested attribute was {!r}".format(requested_attribute))
-            raise
-        self._call_index += 1
-        print(self, f"next call: {call!r}")
+        if _TRACE:
+            print(self, "in `_next_script_call`")
+        call = next(self._script_calls, None)
+        if call is None:
+            print(f"  *** Ran out of `Call` objects for this session {self!r}")
+            print(f"  Requested attribute was {requested_attribute!r}")
+            raise IndexError("no more `Call` objects in script")
+        if _TRACE:
+            print(self, f"next call: {call!r}")
         return call
 
-    def __getattr__(self, attribute_name):
-        script_call = self._next_script_call(attribute_name)
+    def _script_method(self, method_name):
+        """
+        Return a function for the method `method_name`.
+
+        When called, the function takes the next `Call` object from the
+        script, checks it against the method name and the arguments and
+        returns the result from the `Call` object (or raises the exception).
+        """
 
-        def dummy_method(*args, **kwargs):
-            print(self, "in `__getattr__`")
-            script_call.check_call(attribute_name, args, kwargs)
-            return script_call()
+        def script_method(*args, **kwargs):
+            script_call = self._next_script_call(method_name)
+            if _TRACE:
+                print(self, f"in `{method_name}`")
+            return script_call.invoke(method_name, args, kwargs)
 
-        return dummy_method
+        return script_method
+
+    def __getattr__(self, attribute_name):
+        # Only reached for names which aren't installed as script methods, for
+        # example names which aren't in the script or are matched by a `None`
+        # method name. Like the installed script methods, take the next `Call`
+        # only when the method is called, not when the attribute is accessed.
+        # If the name doesn't match, the mismatch is reported.
+        return self._script_method(attribute_name)
 
     # ----------------------------------------------------------------------
     # `ftplib.FTP` methods that shouldn't be executed with the default
@@ -177,8 +291,8 @@ class ScriptedSession:
         script_call.check_call("dir", (path,), None)
         # Give `dir` the chance to raise an exception if one was specified in
         # the `Call`'s `result` argument.
-        call_result = script_call()
-        for line in call_result.splitlines():
+        script_call()
+        for line in script_call.lines:
             callback(line)
 
     def ntransfercmd(self, cmd, rest=None):
@@ -195,12 +309,10 @@ class ScriptedSession:
         # Give `ntransfercmd` the chance to raise an exception if one was
         # specified in the `Call`'s `result` argument.
         call_result = script_call()
-        mock_socket = unittest.mock.Mock(name="socket")
-        mock_socket.makefile.return_value = call_result
         # Return `None` for size. The docstring of `ftplib.FTP.ntransfercmd`
         # says that's a possibility.
         # TODO: Use a sensible `size` value later if it turns out we need it.
-        return mock_socket, None
+        return _DataSocket(call_result), None
 
     def transfercmd(self, cmd, rest=None):
         """
@@ -215,9 +327,7 @@ class ScriptedSession:
         # Give `transfercmd` the chance to raise an exception if one was
         # specified in the `Call`'s `result` argument.
         call_result = script_call()
-        mock_socket = unittest.mock.Mock(name="socket")
-        mock_socket.makefile.return_value = call_result
-        return mock_socket
+        return _DataSocket(call_result)
 
 
 class MultisessionFactory:
@@ -238,8 +348,9 @@ class MultisessionFactory:
     """
 
     def __init__(self, *scripts):
-        ScriptedSession.reset_session_count()
-        self._scripts = iter(scripts)
+        self._scripts = scripts
+        # Index of the script for the next session
+        self._script_index = 0
         self.scripted_sessions = []
 
     def __call__(self, host, user, password):
@@ -249,8 +360,15 @@ class MultisessionFactory:
         This is equivalent to the constructor of the session (e. g.
         `ftplib.FTP` in a real application).
         """
-        script = next(self._scripts)
-        scripted_session = ScriptedSession(script)
+        script_index = self._script_index
+        if script_index >= len(self._scripts):
+            raise IndexError(
+                f"factory has only {len(self._scripts)} script(s), "
+                f"can't create session {script_index + 1}"
+            )
+        self._script_index = script_index + 1
+        script = self._scripts[script_index]
+        scripted_session = ScriptedSession(script, session_number=script_index + 1)
         self.scripted_sessions.append(scripted_session)
         return scripted_session
 
@@ -565,19 +565,15 @@ class TestUploadAndDownload:
         # Download
         with test_base.ftp_host_factory(multisession_factory) as host:
             host.download(remote_file_name, str(local_target))
-        # Verify expected operations on mock socket as done in `FTPFile.close`.
+        # Verify expected operations on the socket as done in `FTPFile.close`.
         # We expect one `gettimeout` and two `settimeout` calls.
         file_session = multisession_factory.scripted_sessions[1]
-        file_session.sock.gettimeout.assert_called_once_with()
-        assert len(file_session.sock.settimeout.call_args_list) == 2
-        assert file_session.sock.settimeout.call_args_list[0] == (
-            (ftputil.file.FTPFile._close_timeout,),
-            {},
-        )
-        assert file_session.sock.settimeout.call_args_list[1] == (
-            (file_session.sock.gettimeout(),),
-            {},
-        )
+        assert file_session.sock.gettimeout_count == 1
+        # The second `settimeout` call restores the original timeout.
+        assert file_session.sock.settimeout_args == [
+            ftputil.file.FTPFile._close_timeout,
+            None,
+        ]
         assert local_target.read_bytes() == remote_file_content
 
     def test_conditional_upload_without_upload(self, tmp_path):
@@ -0,0 +1,137 @@
+# Copyright (C) 2009-2026, Stefan Schwarzer <sschwarzer@sschwarzer.net>
+# and ftputil contributors (see `doc/contributors.txt`)
+# See the file LICENSE for licensing terms.
+
+import itertools
+
+import pytest
+
+import ftputil.lrucache
+from ftputil.lrucache import CacheKeyError, LRUCache
+
+
+class TestLRUCache:
+    def test_get_set(self):
+        cache = LRUCache(3)
+        with pytest.raises(CacheKeyError):
+            cache["a"]
+        cache["a"] = 1
+        assert cache["a"] == 1
+        assert "a" in cache
+        assert len(cache) == 1
+        # Replace existing value
+        cache["a"] = 2
+        assert cache["a"] == 2
+        assert len(cache) == 1
+
+    def test_eviction_order(self):
+        """
+        If the cache is full, adding an item should remove the least recently
+        used item. Reading and writing an item both count as use.
+        """
+        cache = LRUCache(3)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache["c"] = 3
+        # Now "b" is the least recently used item.
+        cache["a"]
+        cache["d"] = 4
+        assert list(cache) == ["c", "a", "d"]
+        # Now "a" is the least recently used item.
+        cache["c"] = 5
+        cache["e"] = 6
+        assert list(cache) == ["d", "c", "e"]
+        assert cache["c"] == 5
+        assert len(cache) == 3
+
+    def test_node_reuse(self):
+        """
+        A node reused for a new item after an eviction should hold the data of
+        the new item only.
+        """
+        cache = LRUCache(2)
+        cache["a"] = 1
+        cache["b"] = 2
+        for i in range(10):
+            cache[i] = str(i)
+            assert cache[i] == str(i)
+        assert list(cache) == [8, 9]
+        assert "a" not in cache
+        assert "b" not in cache
+        assert cache[8] == "8"
+
+    def test_delete_and_reinsert(self):
+        cache = LRUCache(3)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache["c"] = 3
+        del cache["a"]
+        assert "a" not in cache
+        assert len(cache) == 2
+        with pytest.raises(CacheKeyError):
+            del cache["a"]
+        # Reinserted items are the most recently used ones.
+        cache["a"] = 4
+        assert list(cache) == ["b", "c", "a"]
+        assert cache["a"] == 4
+        cache["d"] = 5
+        assert list(cache) == ["c", "a", "d"]
+
+    def test_shrink_on_resize(self):
+        cache = LRUCache(5)
+        for i in range(5):
+            cache[i] = i
+        cache[0]
+        cache.size = 2
+        assert cache.size == 2
+        # The least recently used items should have been removed.
+        assert list(cache) == [4, 0]
+        cache[5] = 5
+        assert list(cache) == [0, 5]
+
+    def test_invalid_size(self):
+        with pytest.raises(TypeError):
+            LRUCache(2.0)
+        with pytest.raises(ValueError):
+            LRUCache(0)
+        cache = LRUCache(2)
+        with pytest.raises(ValueError):
+            cache.size = -1
+
+    def test_mtime(self, monkeypatch):
+        """
+        Setting an item should update its modification time, reading it
+        shouldn't.
+        """
+        timestamps = itertools.count(1000.0)
+        monkeypatch.setattr(ftputil.lrucache.time, "time", lambda: next(timestamps))
+        cache = LRUCache(2)
+        with pytest.raises(CacheKeyError):
+            cache.mtime("a")
+        cache["a"] = 1
+        assert cache.mtime("a") == 1000.0
+        cache["a"]
+        assert cache.mtime("a") == 1000.0
+        cache["a"] = 2
+        assert cache.mtime("a") == 1002.0
+        # The reused node of an evicted item should get a new timestamp.
+        cache["b"] = 3
+        cache["c"] = 4
+        assert cache.mtime("c") == 1004.0
+
+    def test_iteration_during_access(self):
+        """
+        Reading items while iterating over the cache shouldn't change the
+        iteration.
+        """
+        cache = LRUCache(3)
+        for key in "abc":
+            cache[key] = key
+        assert [cache[key] for key in cache] == ["a", "b", "c"]
+
+    def test_clear(self):
+        cache = LRUCache(3)
+        cache["a"] = 1
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.size == 3
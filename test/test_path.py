@@ -163,23 +163,15 @@ class TestPath:
             # `isdir` call
             Call("cwd", args=("/",)),
             Call("cwd", args=("/",)),
-            #  Look for `/some_link`
-            Call("dir", args=("",), result=dir_line),
-            Call("cwd", args=("/",)),
-            Call("cwd", args=("/",)),
-            Call("cwd", args=("/",)),
-            #  Look for `/nonexistent`
+            #  Look for `/some_link` and, in the same listing, for
+            #  `/nonexistent`
             Call("dir", args=("",), result=dir_line),
             Call("cwd", args=("/",)),
             # `isfile` call
             Call("cwd", args=("/",)),
             Call("cwd", args=("/",)),
-            #  Look for `/some_link`
-            Call("dir", args=("",), result=dir_line),
-            Call("cwd", args=("/",)),
-            Call("cwd", args=("/",)),
-            Call("cwd", args=("/",)),
-            #  Look for `/nonexistent`
+            #  Look for `/some_link` and, in the same listing, for
+            #  `/nonexistent`
             Call("dir", args=("",), result=dir_line),
             Call("cwd", args=("/",)),
             # `islink` call
@@ -8,7 +8,9 @@ Unit tests for session factory helpers.
 
 import ftplib
 import functools
+import socket
 import sys
+import unittest.mock
 
 import pytest
 
@@ -73,6 +75,11 @@ class TestSessionFactory:
     trigger the expected calls.
     """
 
+    def setup_method(self):
+        # Use fresh session factory classes, including their caches for the
+        # server features, for each test.
+        ftputil.session._session_class.cache_clear()
+
     @staticmethod
     def _expected_session_calls_for_encoding_handling(encoding, feat_command_output):
         """
@@ -147,7 +154,9 @@ class TestSessionFactory:
             ("login", "user", "password"),
             ("prot_p",),
         ] + self._expected_session_calls_for_encoding_handling(None, "")
-        #
+        # This is the same factory as above. Start over to get a `FEAT`
+        # command again.
+        ftputil.session._session_class.cache_clear()
         factory = ftputil.session.session_factory(
             base_class=EncryptedMockSession, encrypt_data_channel=True
         )
@@ -167,6 +176,24 @@ class TestSessionFactory:
             ("login", "user", "password"),
         ] + self._expected_session_calls_for_encoding_handling(None, "")
 
+    def test_prot_p_of_derived_class(self):
+        """
+        If a class derived from the session factory overrides `prot_p`, use
+        the overridden method.
+        """
+        factory = ftputil.session.session_factory(base_class=EncryptedMockSession)
+
+        class DerivedSession(factory):
+            def prot_p(self):
+                self.add_call("derived_prot_p")
+
+        session = DerivedSession("host", "user", "password")
+        assert session.calls == [
+            ("connect", "host", 21),
+            ("login", "user", "password"),
+            ("derived_prot_p",),
+        ] + self._expected_session_calls_for_encoding_handling(None, "")
+
     @pytest.mark.parametrize(
         "encoding, feat_command_output, expected_encoding, expected_session_calls_for_encoding_handling",
         [
@@ -233,3 +260,248 @@ class TestSessionFactory:
             ("set_debuglevel", 1),
             ("login", "user", "password"),
         ] + self._expected_session_calls_for_encoding_handling(None, "")
+
+    def test_fast_utf8(self):
+        """
+        With `fast_utf8=True`, send "OPTS UTF8 ON" without a preceding "FEAT"
+        if the encoding is UTF-8.
+        """
+        factory = ftputil.session.session_factory(
+            base_class=MockSession, encoding="UTF-8", fast_utf8=True
+        )
+        session = factory("host", "user", "password")
+        assert session.calls == [
+            ("connect", "host", 21),
+            ("login", "user", "password"),
+            ("sendcmd", "OPTS UTF8 ON"),
+        ]
+        # No UTF-8 encoding, so don't send anything.
+        factory = ftputil.session.session_factory(
+            base_class=MockSession, encoding="latin1", fast_utf8=True
+        )
+        session = factory("host", "user", "password")
+        assert session.calls == [
+            ("connect", "host", 21),
+            ("login", "user", "password"),
+        ]
+
+    def test_fast_utf8_with_error_response(self):
+        """
+        With `fast_utf8=True`, ignore an error response for "OPTS UTF8 ON".
+        """
+
+        class RejectingMockSession(MockSession):
+            def sendcmd(self, command):
+                super().sendcmd(command)
+                raise ftplib.error_perm("501 unknown option")
+
+        factory = ftputil.session.session_factory(
+            base_class=RejectingMockSession, encoding="UTF-8", fast_utf8=True
+        )
+        session = factory("host", "user", "password")
+        assert session.calls == [
+            ("connect", "host", 21),
+            ("login", "user", "password"),
+            ("sendcmd", "OPTS UTF8 ON"),
+        ]
+
+    @pytest.mark.parametrize("encoding", ["UTF-8", "utf-8", "UTF8", "Utf8"])
+    def test_utf8_encoding_names(self, encoding):
+        """
+        Spellings of UTF-8 that differ only in case should all lead to "OPTS
+        UTF8 ON".
+        """
+
+        class Utf8MockSession(MockSession):
+            def __init__(self, encoding=None):
+                super().__init__(encoding, feat_command_output=UTF8_FEAT_STRING)
+
+        factory = ftputil.session.session_factory(
+            base_class=Utf8MockSession, encoding=encoding
+        )
+        session = factory("host", "user", "password")
+        assert session.calls == [
+            ("connect", "host", 21),
+            ("login", "user", "password"),
+            ("sendcmd", "FEAT"),
+            ("sendcmd", "OPTS UTF8 ON"),
+        ]
+
+    def test_same_arguments_give_same_factory(self):
+        """
+        Session factories created with the same arguments should be the same
+        class.
+        """
+        factory1 = ftputil.session.session_factory(base_class=MockSession, port=2121)
+        factory2 = ftputil.session.session_factory(base_class=MockSession, port=2121)
+        assert factory1 is factory2
+        factory3 = ftputil.session.session_factory(base_class=MockSession, port=2122)
+        assert factory3 is not factory1
+
+    def test_feature_cache(self):
+        """
+        Send "FEAT" only for the first session to a host.
+        """
+
+        class Utf8MockSession(MockSession):
+            def __init__(self, encoding=None):
+                super().__init__(encoding, feat_command_output=UTF8_FEAT_STRING)
+
+        factory = ftputil.session.session_factory(
+            base_class=Utf8MockSession, encoding="UTF-8"
+        )
+        session = factory("host", "user", "password")
+        assert session.calls == [
+            ("connect", "host", 21),
+            ("login", "user", "password"),
+            ("sendcmd", "FEAT"),
+            ("sendcmd", "OPTS UTF8 ON"),
+        ]
+        # Same host, so use the cached features.
+        session = factory("host", "user", "password")
+        assert session.calls == [
+            ("connect", "host", 21),
+            ("login", "user", "password"),
+            ("sendcmd", "OPTS UTF8 ON"),
+        ]
+        # Different host
+        session = factory("other_host", "user", "password")
+        assert session.calls == [
+            ("connect", "other_host", 21),
+            ("login", "user", "password"),
+            ("sendcmd", "FEAT"),
+            ("sendcmd", "OPTS UTF8 ON"),
+        ]
+
+    def test_feature_cache_key(self):
+        """
+        Cache the features per host, port and user, and don't fail if the
+        cached features don't apply to a session.
+        """
+
+        class ProxyMockSession(MockSession):
+            """
+            Mock for a proxy which forwards to a server that supports UTF-8
+            only for the user "user".
+            """
+
+            def login(self, user, password):
+                super().login(user, password)
+                if user == "user":
+                    self._feat_command_output = UTF8_FEAT_STRING
+
+            def sendcmd(self, command):
+                result = super().sendcmd(command)
+                if command == "OPTS UTF8 ON" and not self._feat_command_output:
+                    raise ftplib.error_perm("501 unknown option")
+                return result
+
+        factory = ftputil.session.session_factory(
+            base_class=ProxyMockSession, encoding="UTF-8"
+        )
+        factory("host", "user", "password")
+        # Different user, so don't use the cached features.
+        session = factory("host", "other_user", "password")
+        assert session.calls == [
+            ("connect", "host", 21),
+            ("login", "other_user", "password"),
+            ("sendcmd", "FEAT"),
+        ]
+        # Simulate outdated cached features. The error response for "OPTS UTF8
+        # ON" should be ignored and the `UTF8` feature removed from the cache.
+        feature_cache = factory._feature_cache
+        feature_cache[("host", 21, "other_user")] = ftputil.session._FEATURE_BITS[
+            "UTF8"
+        ]
+        session = factory("host", "other_user", "password")
+        assert session.calls == [
+            ("connect", "host", 21),
+            ("login", "other_user", "password"),
+            ("sendcmd", "OPTS UTF8 ON"),
+        ]
+        assert feature_cache[("host", 21, "other_user")] == 0
+
+    def test_utf8_feature_with_rejected_opts(self):
+        """
+        If the server lists the `UTF8` feature, but rejects "OPTS UTF8 ON",
+        all sessions should be created successfully, and only the first one
+        should send the commands.
+        """
+
+        class RejectingMockSession(MockSession):
+            def __init__(self, encoding=None):
+                super().__init__(encoding, feat_command_output=UTF8_FEAT_STRING)
+
+            def sendcmd(self, command):
+                result = super().sendcmd(command)
+                if command == "OPTS UTF8 ON":
+                    raise ftplib.error_perm("501 unknown option")
+                return result
+
+        factory = ftputil.session.session_factory(
+            base_class=RejectingMockSession, encoding="UTF-8"
+        )
+        session = factory("host", "user", "password")
+        assert session.calls == [
+            ("connect", "host", 21),
+            ("login", "user", "password"),
+            ("sendcmd", "FEAT"),
+            ("sendcmd", "OPTS UTF8 ON"),
+        ]
+        for _ in range(3):
+            session = factory("host", "user", "password")
+            assert session.calls == [
+                ("connect", "host", 21),
+                ("login", "user", "password"),
+            ]
+
+    def test_tcp_nodelay(self):
+        """
+        Test setting `TCP_NODELAY` on the command channel socket.
+        """
+
+        class SocketMockSession(MockSession):
+            def connect(self, host, port):
+                super().connect(host, port)
+                self.sock = unittest.mock.Mock()
+
+        factory = ftputil.session.session_factory(base_class=SocketMockSession)
+        session = factory("host", "user", "password")
+        session.sock.setsockopt.assert_called_once_with(
+            socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+        )
+        #
+        factory = ftputil.session.session_factory(
+            base_class=SocketMockSession, tcp_nodelay=False
+        )
+        session = factory("host", "user", "password")
+        session.sock.setsockopt.assert_not_called()
+        # Without a socket, nothing should happen.
+        factory = ftputil.session.session_factory(base_class=MockSession)
+        session = factory("host", "user", "password")
+        assert session.sock is None
+
+
+def test_feature_bits():
+    """
+    Test extraction of the features from `FEAT` output.
+    """
+    feature_bits = ftputil.session._FEATURE_BITS
+    feat_output = (
+        "211-Features:\n"
+        " MDTM\n"
+        " MLST size*;modify*;type*;\n"
+        " REST STREAM\n"
+        " utf8\n"
+        " UNKNOWN\n"
+        "211 End"
+    )
+    assert ftputil.session._feature_bits(feat_output) == (
+        feature_bits["MDTM"]
+        | feature_bits["MLST"]
+        | feature_bits["REST STREAM"]
+        | feature_bits["UTF8"]
+    )
+    # Feature lines must start with exactly one space.
+    assert ftputil.session._feature_bits("211-Features:\nUTF8\n  SIZE\n211 End") == 0
+    assert ftputil.session._feature_bits("") == 0
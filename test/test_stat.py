@@ -285,6 +285,81 @@ class TestParsers:
         ]
         self._test_valid_lines(ftputil.stat.UnixParser, lines, expected_stat_results)
 
+    def test_ignores_line(self):
+        parser = ftputil.stat.UnixParser()
+        for line in ["", " ", "total 14", "total\t14", "total  14 blocks"]:
+            assert parser.ignores_line(line)
+        for line in [
+            "total",
+            "total x",
+            "totals 14",
+            " total 14",
+            "-rw-r--r--   1 45854    200          4604 Dec 19 23:11 total 14",
+        ]:
+            assert not parser.ignores_line(line)
+
+    def test_parse_name(self):
+        """
+        Test `parse_name` for the Unix and MS parsers.
+        """
+        unix_parser = ftputil.stat.UnixParser()
+        unix_lines_and_names = [
+            ("drwxr-sr-x   2 45854    200   512 May  4  2000 chemeng", "chemeng"),
+            ("-rw-r--r--   1 45854    200  4604 Dec 19 23:11 a b", "a b"),
+            ("lrwxrwxrwx   2 45854    200     6 May 29  2000 link -> ../x", "link"),
+            # Alternative format without user field
+            ("drwxr-sr-x   2   200           512 May  4  2000 chemeng", "chemeng"),
+        ]
+        for line, expected_name in unix_lines_and_names:
+            assert unix_parser.parse_name(line) == expected_name
+            assert unix_parser.parse_name(line) == unix_parser.parse_line(line)._st_name
+        for line in [
+            "xrwxr-sr-x   2 45854    200           512 May  4  2000 chemeng",
+            "drwxr-sr-x   2 45854    200   512 May 29  2000 os1 -> os2 -> os3",
+            "10-23-01  03:25PM       <DIR>          WindowsXP",
+        ]:
+            with pytest.raises(ftputil.error.ParserError):
+                unix_parser.parse_name(line)
+        ms_parser = ftputil.stat.MSParser()
+        assert (
+            ms_parser.parse_name("10-23-01  03:25PM       <DIR>    Windows XP")
+            == "Windows XP"
+        )
+        with pytest.raises(ftputil.error.ParserError):
+            ms_parser.parse_name("10-23-01  03:25PM       <DIR>")
+
+    def test_parse_unix_mode_with_non_ascii_characters(self):
+        """
+        Any character other than "-" in the permission string should set the
+        corresponding bit, even if it's non-ASCII whitespace or a digit.
+        """
+        parser = ftputil.stat.UnixParser()
+        for mode_string in ["-rwxr-xr-\xa0", "-\xa0wxr-xr-x", "-rwxr-xr-\u0660"]:
+            assert parser.parse_unix_mode(mode_string) == stat.S_IFREG | 0o755
+
+    def test_parse_name_with_overridden_parse_line(self):
+        """
+        If a derived parser class overrides `parse_line`, `parse_name` should
+        use it.
+        """
+
+        class CustomUnixParser(ftputil.stat.UnixParser):
+            def parse_line(self, line, time_shift=0.0):
+                stat_result = super().parse_line(line, time_shift)
+                stat_result._st_name = stat_result._st_name.upper()
+                return stat_result
+
+        class CustomMSParser(ftputil.stat.MSParser):
+            def parse_line(self, line, time_shift=0.0):
+                stat_result = super().parse_line(line, time_shift)
+                stat_result._st_name = stat_result._st_name.upper()
+                return stat_result
+
+        line = "drwxr-sr-x   2 45854    200   512 May  4  2000 chemeng"
+        assert CustomUnixParser().parse_name(line) == "CHEMENG"
+        line = "10-23-01  03:25PM       <DIR>    Windows XP"
+        assert CustomMSParser().parse_name(line) == "WINDOWS XP"
+
     def test_invalid_unix_lines(self):
         lines = [
             # Not intended to be parsed. Should have been filtered out by
@@ -563,6 +638,48 @@ class TestParsers:
         # three hours minus one minute
         self._test_time_shift(-3 * 60 * 60, 60)
 
+    def test_preset_utc_now(self):
+        """
+        If `_utc_now` is set on the parser, use it as the current time to
+        determine the year of a datetime without year.
+        """
+        parser = ftputil.stat.UnixParser()
+        parser._utc_now = datetime.datetime(
+            2019, 1, 10, 12, 0, tzinfo=datetime.timezone.utc
+        )
+        # Time without year in the "future", so this must be from last year.
+        assert parser.parse_unix_time("Dec", "19", "23:11", 0.0) == (
+            stat_tuple_to_seconds((2018, 12, 19, 23, 11, 0))
+        )
+        # Time without year in the "past", so this must be from this year.
+        assert parser.parse_unix_time("Jan", "9", "23:11", 0.0) == (
+            stat_tuple_to_seconds((2019, 1, 9, 23, 11, 0))
+        )
+
+    def test_cached_unix_time_depends_on_current_minute(self):
+        """
+        Results of `parse_unix_time` are cached, but mustn't be reused if the
+        current server time has changed to another minute.
+        """
+        parser = ftputil.stat.UnixParser()
+        parser._utc_now = datetime.datetime(
+            2019, 12, 19, 23, 8, 30, tzinfo=datetime.timezone.utc
+        )
+        # More than two minutes in the future, so assume the previous year.
+        assert parser.parse_unix_time("Dec", "19", "23:11", 0.0) == (
+            stat_tuple_to_seconds((2018, 12, 19, 23, 11, 0))
+        )
+        # Same minute, so same result
+        parser._utc_now = parser._utc_now.replace(second=59)
+        assert parser.parse_unix_time("Dec", "19", "23:11", 0.0) == (
+            stat_tuple_to_seconds((2018, 12, 19, 23, 11, 0))
+        )
+        # Next minute, so now the time is in the current year.
+        parser._utc_now = parser._utc_now.replace(minute=9, second=0)
+        assert parser.parse_unix_time("Dec", "19", "23:11", 0.0) == (
+            stat_tuple_to_seconds((2019, 12, 19, 23, 11, 0))
+        )
+
 
 class TestLstatAndStat:
     """
@@ -597,6 +714,23 @@ class TestLstatAndStat:
             )
             assert repr(stat_result) == expected_result
 
+    def test_stat_result_attributes(self):
+        """
+        Test reading and assigning the `st_*` attributes of a `StatResult`.
+        """
+        stat_result = ftputil.stat.StatResult(
+            (17901, None, None, 2, "45854", "200", 512, None, 957398400.0, None)
+        )
+        assert stat_result.st_mode == 17901
+        assert stat_result.st_size == 512
+        assert stat_result.st_mtime == 957398400.0
+        with pytest.raises(AttributeError):
+            stat_result.st_unknown
+        # Custom parsers and client code may assign the attributes.
+        stat_result.st_mtime = 0.0
+        assert stat_result.st_mtime == 0.0
+        assert stat_result[8] == 957398400.0
+
     def test_failing_lstat(self):
         """
         Test whether `lstat` fails for a nonexistent path.
@@ -830,18 +964,13 @@ class TestLstatAndStat:
             Call("pwd", result="/"),
             Call("cwd", args=("/",)),
             Call("cwd", args=("/",)),
+            # The link target is in the same directory, so one `dir` call is
+            # enough, even with a disabled cache.
             Call(
                 "dir",
                 args=("",),
-                result="lrwxrwxrwx   1 45854   200   21 Jan 19  2002 link -> link_target",
-            ),
-            Call("cwd", args=("/",)),
-            Call("cwd", args=("/",)),
-            Call("cwd", args=("/",)),
-            Call(
-                "dir",
-                args=("",),
-                result="-rw-r--r--   1 45854   200   4604 Jan 19 23:11 link_target",
+                result="lrwxrwxrwx   1 45854   200   21 Jan 19  2002 link -> link_target"
+                "\n-rw-r--r--   1 45854   200   4604 Jan 19 23:11 link_target",
             ),
             Call("cwd", args=("/",)),
             Call("close"),
@@ -856,24 +985,13 @@ class TestLstatAndStat:
             "lrwxrwxrwx   1 45854   200   14   Jan 19  2002 link -> link_target\n"
             "-rw-r--r--   1 45854   200   4604 Jan 19 23:11 link_target"
         )
-        # Note that only one `dir` call would be needed in case of an enabled
-        # cache.
         script = [
             Call("__init__"),
             Call("pwd", result="/"),
             Call("cwd", args=("/",)),
             Call("cwd", args=("/",)),
-            # Look up `/link_link`.
-            Call("dir", args=("",), result=dir_lines),
-            Call("cwd", args=("/",)),
-            Call("cwd", args=("/",)),
-            Call("cwd", args=("/",)),
-            # Look up `/link`.
-            Call("dir", args=("",), result=dir_lines),
-            Call("cwd", args=("/",)),
-            Call("cwd", args=("/",)),
-            Call("cwd", args=("/",)),
-            # Look up `/link_target`.
+            # Look up `/link_link`, `/link` and `/link_target` in the same
+            # listing.
             Call("dir", args=("",), result=dir_lines),
             Call("cwd", args=("/",)),
             Call("close"),
@@ -893,27 +1011,74 @@ class TestLstatAndStat:
             Call("cwd", args=("/",)),
             Call("cwd", args=("/",)),
             # This dir finds the `bad_link1` name requested in the `stat` call.
+            # The link targets are looked up in the same listing.
+            #
+            # FIXME: `stat` looks up the link target pointed to by `bad_link2`,
+            # which is `bad_link1`. Only here ftputil notices the recursive
+            # link chain. Obviously the start of the link chain hadn't been
+            # stored in `visited_paths` (see also ticket #108).
             Call("dir", args=("",), result=dir_lines),
             Call("cwd", args=("/",)),
+            Call("close"),
+        ]
+        with test_base.ftp_host_factory(scripted_session.factory(script)) as host:
+            host.stat_cache.disable()
+            with pytest.raises(ftputil.error.PermanentError):
+                host.stat("bad_link1")
+
+    def test_stat_for_too_long_link_chain(self):
+        """
+        Test that `stat` doesn't follow link chains longer than
+        `_MAX_SYMLINK_DEPTH`.
+        """
+        max_depth = ftputil.stat._MAX_SYMLINK_DEPTH
+        dir_lines = "\n".join(
+            "lrwxrwxrwx   1 45854   200   7 Jan 19  2002 link{} -> link{}".format(
+                index, index + 1
+            )
+            for index in range(max_depth + 1)
+        )
+        script = [
+            Call("__init__"),
+            Call("pwd", result="/"),
             Call("cwd", args=("/",)),
             Call("cwd", args=("/",)),
-            # Look up link target `bad_link2`.
             Call("dir", args=("",), result=dir_lines),
             Call("cwd", args=("/",)),
+            Call("close"),
+        ]
+        with test_base.ftp_host_factory(scripted_session.factory(script)) as host:
+            host.stat_cache.disable()
+            with pytest.raises(ftputil.error.RecursiveLinksError):
+                host.stat("/link0")
+
+    def test_stat_many(self):
+        """
+        Test that `_stat_many` lists a directory only once, even with a
+        disabled cache.
+        """
+        dir_lines = (
+            "lrwxrwxrwx   1 45854   200   14   Jan 19  2002 link -> file2\n"
+            "-rw-r--r--   1 45854   200   4604 Jan 19 23:11 file1\n"
+            "-rw-r--r--   1 45854   200   1234 Jan 19 23:11 file2"
+        )
+        script = [
+            Call("__init__"),
+            Call("pwd", result="/"),
             Call("cwd", args=("/",)),
             Call("cwd", args=("/",)),
-            # FIXME: `stat` looks up the link target pointed to by `bad_link2`,
-            # which is `bad_link1`. Only here ftputil notices the recursive
-            # link chain. Obviously the start of the link chain hadn't been
-            # stored in `visited_paths` (see also ticket #108).
             Call("dir", args=("",), result=dir_lines),
             Call("cwd", args=("/",)),
             Call("close"),
         ]
         with test_base.ftp_host_factory(scripted_session.factory(script)) as host:
             host.stat_cache.disable()
-            with pytest.raises(ftputil.error.PermanentError):
-                host.stat("bad_link1")
+            stat_results = host._stat._stat_many(["/file1", "/link", "/file2"])
+        assert [stat_result.st_size for stat_result in stat_results] == [
+            4604,
+            1234,
+            1234,
+        ]
 
     #
     # Test automatic switching of Unix/MS parsers